@@ -73,7 +73,7 @@ class HomeAssistantWebSocketEndpoint(CommandEndpoint):
                         out.speech = ""
                     command_endpoint_response = CommandEndpointResponse(result=out)
                     self.log.debug(f"sending {command_endpoint_response} to {ws}")
-                    asyncio.ensure_future(ws.send_text(command_endpoint_response.model_dump_json()))
+                    self.app.connmgr.send(ws, command_endpoint_response.model_dump_json())
                     self.connmap.pop(id)
             elif msg["type"] == "auth_required":
                 auth_msg = {
@@ -107,7 +107,10 @@ class HomeAssistantWebSocketEndpoint(CommandEndpoint):
     def next_id(self):
         return int(time.monotonic_ns())
 
-    def send(self, jsondata, ws, client=None):
+    async def send(self, jsondata, ws, client=None):
+        if self.haws is None:
+            raise CommandEndpointRuntimeException(f"{self.name} not connected")
+
         id = self.next_id()
 
         if id not in self.connmap:
@@ -129,7 +132,11 @@ class HomeAssistantWebSocketEndpoint(CommandEndpoint):
             out["device_id"] = self.ha_willow_devices[client.mac_addr]
 
         self.log.debug(f"sending to HA WS: {out}")
-        asyncio.ensure_future(self.haws.send(json.dumps(out)))
+        try:
+            await self.haws.send(json.dumps(out))
+        except Exception as e:
+            self.connmap.pop(id, None)
+            raise CommandEndpointRuntimeException(e)
 
     def stop(self):
         self.log.info(f"stopping {self.name}")
@@ -1,68 +1,97 @@
 from logging import getLogger
 
 from app.db.main import get_config_db
-from app.internal.command_endpoints.ha_ws import (
-    HomeAssistantWebSocketEndpoint,
-)
-from app.internal.command_endpoints.mqtt import MqttConfig, MqttEndpoint
-from app.internal.command_endpoints.openhab import OpenhabEndpoint
-from app.internal.command_endpoints.rest import RestEndpoint
 
 
 log = getLogger("WAS")
 
 
-def init_command_endpoint(app):
-    # call command_endpoint.stop() to avoid leaking asyncio task
-    try:
-        app.command_endpoint.stop()
-    except Exception:
-        pass
+# endpoint modules are imported on use, only one of them is ever active
+def _init_hass(app, uc):
+    from app.internal.command_endpoints.ha_ws import HomeAssistantWebSocketEndpoint
+
+    return HomeAssistantWebSocketEndpoint(app, uc["hass_host"], uc["hass_port"], uc["hass_tls"], uc["hass_token"])
+
+
+def _init_mqtt(app, uc):
+    from app.internal.command_endpoints.mqtt import MqttConfig, MqttEndpoint
+
+    mqtt_config = MqttConfig()
+    mqtt_config.set_auth_type(uc["mqtt_auth_type"])
+    mqtt_config.set_hostname(uc["mqtt_host"])
+    mqtt_config.set_port(uc["mqtt_port"])
+    mqtt_config.set_tls(uc["mqtt_tls"])
+    mqtt_config.set_topic(uc["mqtt_topic"])
+
+    password = uc.get("mqtt_password")
+    if password is not None:
+        mqtt_config.set_password(password)
 
-    user_config = get_config_db()
+    username = uc.get("mqtt_username")
+    if username is not None:
+        mqtt_config.set_username(username)
 
-    if "was_mode" in user_config and user_config["was_mode"]:
-        log.info("WAS Endpoint mode enabled")
+    return MqttEndpoint(mqtt_config)
 
-        if user_config["command_endpoint"] == "Home Assistant":
 
-            host = user_config["hass_host"]
-            port = user_config["hass_port"]
-            tls = user_config["hass_tls"]
-            token = user_config["hass_token"]
+def _init_openhab(app, uc):
+    from app.internal.command_endpoints.openhab import OpenhabEndpoint
 
-            app.command_endpoint = HomeAssistantWebSocketEndpoint(app, host, port, tls, token)
+    return OpenhabEndpoint(uc["openhab_url"], uc["openhab_token"], app.http_client)
 
-        elif user_config["command_endpoint"] == "MQTT":
-            mqtt_config = MqttConfig()
-            mqtt_config.set_auth_type(user_config["mqtt_auth_type"])
-            mqtt_config.set_hostname(user_config["mqtt_host"])
-            mqtt_config.set_port(user_config["mqtt_port"])
-            mqtt_config.set_tls(user_config["mqtt_tls"])
-            mqtt_config.set_topic(user_config["mqtt_topic"])
 
-            if 'mqtt_password' in user_config:
-                mqtt_config.set_password(user_config['mqtt_password'])
+def _init_rest(app, uc):
+    from app.internal.command_endpoints.rest import RestEndpoint
 
-            if 'mqtt_username' in user_config:
-                mqtt_config.set_username(user_config['mqtt_username'])
+    endpoint = RestEndpoint(uc["rest_url"], app.http_client)
 
-            app.command_endpoint = MqttEndpoint(mqtt_config)
+    for key, setter in (
+        ("rest_auth_type", endpoint.config.set_auth_type),
+        ("rest_auth_header", endpoint.config.set_auth_header),
+        ("rest_auth_pass", endpoint.config.set_auth_pass),
+        ("rest_auth_user", endpoint.config.set_auth_user),
+    ):
+        value = uc.get(key)
+        if value is not None:
+            setter(value)
 
-        elif user_config["command_endpoint"] == "openHAB":
-            app.command_endpoint = OpenhabEndpoint(user_config["openhab_url"], user_config["openhab_token"])
+    return endpoint
 
-        elif user_config["command_endpoint"] == "REST":
-            app.command_endpoint = RestEndpoint(user_config["rest_url"])
 
-            if hasattr(user_config, "rest_auth_type"):
-                app.command_endpoint.config.set_auth_type(user_config["rest_auth_type"])
+# endpoint name: (prefix of its user config keys, init function)
+COMMAND_ENDPOINTS = {
+    "Home Assistant": ("hass_", _init_hass),
+    "MQTT": ("mqtt_", _init_mqtt),
+    "openHAB": ("openhab_", _init_openhab),
+    "REST": ("rest_", _init_rest),
+}
+
+
+def init_command_endpoint(app):
+    uc = get_config_db()
+
+    config_key = None
+    name = uc.get("command_endpoint")
+    if uc.get("was_mode") and name in COMMAND_ENDPOINTS:
+        prefix, init = COMMAND_ENDPOINTS[name]
+        config_key = (name, {k: v for k, v in uc.items() if k.startswith(prefix)})
+
+        # keep the running endpoint, and its connection, when its configuration did not change
+        if config_key == getattr(app.command_endpoint, "config_key", None):
+            log.info(f"{app.command_endpoint.name} configuration unchanged")
+            return
+
+    # call command_endpoint.stop() to avoid leaking asyncio task
+    try:
+        app.command_endpoint.stop()
+    except Exception:
+        pass
+    app.command_endpoint = None
 
-            if "rest_auth_header" in user_config:
-                app.command_endpoint.config.set_auth_header(user_config["rest_auth_header"])
+    if config_key is None:
+        return
 
-            if "rest_auth_pass" in user_config:
-                app.command_endpoint.config.set_auth_pass(user_config["rest_auth_pass"])
+    log.info("WAS Endpoint mode enabled")
 
-            if "rest_auth_user" in user_config:
-                app.command_endpoint.config.set_auth_user(user_config["rest_auth_user"])
+    app.command_endpoint = init(app, uc)
+    app.command_endpoint.config_key = config_key
@@ -4,9 +4,10 @@ from .rest import RestAuthType, RestConfig, RestEndpoint
 class OpenhabEndpoint(RestEndpoint):
     name = "WAS openHAB Endpoint"
 
-    def __init__(self, url, token):
+    def __init__(self, url, token, http_client):
         self.config = RestConfig(auth_type=RestAuthType.BASIC, auth_user=token)
+        self.http_client = http_client
         self.url = f"{url}/rest/voice/interpreters"
 
-    def send(self, jsondata=None, ws=None, client=None):
-        return super().send(data=jsondata["text"])
+    async def send(self, jsondata=None, ws=None, client=None):
+        return await super().send(data=jsondata["text"])
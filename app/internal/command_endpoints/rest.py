@@ -8,8 +8,7 @@ from . import (
     CommandEndpointRuntimeException
 )
 from enum import Enum
-from requests import request
-from requests.auth import HTTPBasicAuth
+from httpx import BasicAuth, Timeout
 
 
 class RestAuthType(Enum):
@@ -52,13 +51,14 @@ class RestConfig():
 class RestEndpoint(CommandEndpoint):
     name = "REST"
 
-    def __init__(self, url):
+    def __init__(self, url, http_client):
         self.config = RestConfig()
+        self.http_client = http_client
         self.url = url
 
     def parse_response(self, response):
         res = CommandEndpointResult()
-        if response.ok:
+        if not response.is_error:
             res.ok = True
             if len(res.speech) > 0:
                 res.speech = response.text
@@ -68,7 +68,7 @@ class RestEndpoint(CommandEndpoint):
         command_endpoint_response = CommandEndpointResponse(result=res)
         return command_endpoint_response.model_dump_json()
 
-    def send(self, data=None, jsondata=None, ws=None, client=None):
+    async def send(self, data=None, jsondata=None, ws=None, client=None):
         try:
             basic = None
             headers = {}
@@ -79,7 +79,7 @@ class RestEndpoint(CommandEndpoint):
                 headers['Content-Type'] = 'text/plain'
 
             if self.config.auth_type == RestAuthType.BASIC:
-                basic = HTTPBasicAuth(self.config.auth_user, self.config.auth_pass)
+                basic = BasicAuth(self.config.auth_user, self.config.auth_pass)
             elif self.config.auth_type == RestAuthType.HEADER:
                 headers['Authorization'] = self.config.auth_header
             elif self.config.auth_type == RestAuthType.NONE:
@@ -87,7 +87,9 @@ class RestEndpoint(CommandEndpoint):
             else:
                 raise CommandEndpointConfigException("invalid REST auth type")
 
-            return request("POST", self.url, auth=basic, data=data, headers=headers, json=jsondata, timeout=(1, 30))
+            return await self.http_client.post(
+                self.url, auth=basic, content=data, headers=headers, json=jsondata, timeout=Timeout(30, connect=1)
+            )
 
         except Exception as e:
             raise CommandEndpointRuntimeException(e)
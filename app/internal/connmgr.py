@@ -1,10 +1,18 @@
+import asyncio
 import logging
 
 from fastapi import (
     WebSocket,
     WebSocketException,
 )
-from pydantic import BaseModel, ConfigDict, FieldSerializationInfo, SerializerFunctionWrapHandler, field_serializer
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    FieldSerializationInfo,
+    PrivateAttr,
+    SerializerFunctionWrapHandler,
+    field_serializer,
+)
 from typing import Dict
 
 from .client import Client
@@ -17,6 +25,8 @@ class ConnMgr(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     connected_clients: Dict[WebSocket, Client] = {}
+    _send_queues: Dict[WebSocket, asyncio.Queue] = PrivateAttr(default_factory=dict)
+    _send_tasks: Dict[WebSocket, asyncio.Task] = PrivateAttr(default_factory=dict)
 
     @field_serializer('connected_clients', mode='wrap')
     def serialize_connected_clients(self, value: Dict[WebSocket, Client], nxt: SerializerFunctionWrapHandler, info: FieldSerializationInfo) -> Dict[str, Client]:
@@ -44,6 +54,42 @@ class ConnMgr(BaseModel):
         if ws in self.connected_clients:
             self.connected_clients.pop(ws)
 
+        self._send_queues.pop(ws, None)
+        task = self._send_tasks.pop(ws, None)
+        if task is not None:
+            task.cancel()
+
+    def send(self, ws: WebSocket, msg: str):
+        """Queue a message for a client without waiting for it to be sent
+
+        Messages are written in order by a single task per connection,
+        which is cancelled when the client disconnects.
+        """
+        if ws not in self.connected_clients:
+            log.debug("send: client not connected, dropping message")
+            return
+
+        queue = self._send_queues.get(ws)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._send_queues[ws] = queue
+            self._send_tasks[ws] = asyncio.create_task(self.sender(ws, queue))
+
+        queue.put_nowait(msg)
+
+    async def sender(self, ws: WebSocket, queue: asyncio.Queue):
+        while True:
+            msg = await queue.get()
+            try:
+                await ws.send_text(msg)
+            except Exception as e:
+                log.error(f"Failed to send message: {e}")
+                break
+
+        # the next send() starts a new sender if the client is still connected
+        self._send_queues.pop(ws, None)
+        self._send_tasks.pop(ws, None)
+
     def get_client_by_hostname(self, hostname):
         for k, v in self.connected_clients.items():
             if v.hostname == hostname:
@@ -74,10 +120,12 @@ class ConnMgr(BaseModel):
     def set_notification_active(self, ws, id):
         self.connected_clients[ws].set_notification_active(id)
 
-    def update_client(self, ws, key, value):
-        if key == "hostname":
-            self.connected_clients[ws].set_hostname(value)
-        elif key == "platform":
-            self.connected_clients[ws].set_platform(value)
-        elif key == "mac_addr":
-            self.connected_clients[ws].set_mac_addr(value)
+    def update_client(self, ws, **fields):
+        client = self.connected_clients[ws]
+        for key, value in fields.items():
+            if key == "hostname":
+                client.set_hostname(value)
+            elif key == "platform":
+                client.set_platform(value)
+            elif key == "mac_addr":
+                client.set_mac_addr(value)
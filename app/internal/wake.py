@@ -20,13 +20,22 @@ class WakeSession:
         self.done = False
         self.events = []
         self.id = uuid4()
+        self.task = None
         self.ts = time.time()
         log.debug(f"WakeSession with ID {self.id} created")
 
+    def start(self):
+        loop = asyncio.get_event_loop()
+        self.task = loop.create_task(self.cleanup())
+
     def add_event(self, event):
         log.debug(f"WakeSession {self.id} adding event {event}")
         self.events.append(event)
 
+    def remove_client(self, client):
+        log.debug(f"WakeSession {self.id} removing events from {client}")
+        self.events = [event for event in self.events if event.client != client]
+
     async def cleanup(self, timeout=400):
         await asyncio.sleep(timeout / 1000)
         max_volume = -1000.0
@@ -36,6 +45,11 @@ class WakeSession:
                 max_volume = event.volume
                 winner = event.client
 
+        if winner is None:
+            log.debug(f"Marking WakeSession with ID {self.id} done. No events left.")
+            self.done = True
+            return
+
         # notify winner first
         await winner.send_text(json.dumps({'wake_result': {'won': True}}))
 
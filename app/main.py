@@ -1,9 +1,11 @@
 import asyncio
-import json
 import os
+import re
 
 import alembic
 import alembic.config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from fastapi import (
     FastAPI,
     Header,
@@ -19,6 +21,8 @@ from shutil import move
 from typing import Annotated
 from websockets.exceptions import ConnectionClosed
 from fastapi.middleware.cors import CORSMiddleware
+import httpx
+import ujson
 
 from app.const import (
     ALEMBIC_CONFIG,
@@ -28,7 +32,7 @@ from app.const import (
     STORAGE_USER_NVS,
 )
 
-from app.db.main import get_config_db, migrate_user_client_config, migrate_user_config, migrate_user_nvs
+from app.db.main import engine, get_config_db, migrate_user_client_config, migrate_user_config, migrate_user_nvs
 from app.internal.command_endpoints import (
     CommandEndpointResponse,
     CommandEndpointResult,
@@ -74,19 +78,28 @@ settings = get_settings()
 def db_migrations():
     cfg = alembic.config.Config(ALEMBIC_CONFIG)
     cfg.attributes['logger'] = log
+
+    head = ScriptDirectory.from_config(cfg).get_current_head()
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+
+    if current == head:
+        log.info(f"database schema is up to date at revision {current}")
+        return
+
     alembic.command.upgrade(cfg, "head")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    migrate_user_files()
+    # database schema migrations, moving user files and refreshing TZ config are independent
+    await asyncio.gather(
+        asyncio.to_thread(db_migrations),
+        asyncio.to_thread(migrate_user_files),
+        asyncio.to_thread(get_tz_config, refresh=True),
+    )
     backup_legacy_user_files()
 
-    # database schema migrations
-    db_migrations()
-
-    get_tz_config(refresh=True)
-
     user_config = get_config()
     # skip migration if user_config is empty
     if user_config:
@@ -115,6 +128,13 @@ async def lifespan(app: FastAPI):
             log.error(f"failed to migrate user client config to database: {e}")
     app.connmgr = ConnMgr()
 
+    # shared by the REST and openHAB command endpoints to reuse connections
+    # follow redirects like requests did, e.g. to add a trailing slash to the endpoint URL
+    app.http_client = httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=64),
+    )
+
     app.command_endpoint = None
     try:
         init_command_endpoint(app)
@@ -124,8 +144,11 @@ async def lifespan(app: FastAPI):
     app.notify_queue = NotifyQueue(connmgr=app.connmgr)
     app.notify_queue.start()
 
+    app.wake_session = None
+
     yield
     log.info("shutting down")
+    await app.http_client.aclose()
 
 app = FastAPI(title="Willow Application Server",
               description="Willow Management API",
@@ -135,13 +158,18 @@ app = FastAPI(title="Willow Application Server",
               redoc_url="/redoc",
               version=settings.was_version)
 
-wake_session = None
+RESP_NOT_ACTIVE = CommandEndpointResponse(
+    result=CommandEndpointResult(speech="WAS Command Endpoint not active")
+).model_dump_json()
+RESP_UNREACHABLE = CommandEndpointResponse(
+    result=CommandEndpointResult(speech="WAS Command Endpoint unreachable")
+).model_dump_json()
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
@@ -167,7 +195,7 @@ def backup_legacy_user_files():
 
 def hex_mac(mac):
     if isinstance(mac, list):
-        mac = '%02x:%02x:%02x:%02x:%02x:%02x' % (mac[0], mac[1], mac[2], mac[3], mac[4], mac[5])
+        mac = bytes(mac).hex(':')
     return mac
 
 
@@ -193,6 +221,95 @@ app.include_router(release.router)
 app.include_router(status.router)
 
 
+def disconnect(app, websocket):
+    wake_session = app.wake_session
+    if wake_session is not None and not wake_session.done:
+        wake_session.remove_client(websocket)
+    app.connmgr.disconnect(websocket)
+
+
+async def _handle_wake_start(app, websocket, msg, client):
+    # a single session collects wake events from all clients so the loudest one wins
+    wake_session = app.wake_session
+    if wake_session is None or wake_session.done:
+        wake_session = WakeSession()
+        wake_session.start()
+        app.wake_session = wake_session
+
+    if "wake_volume" in msg["wake_start"]:
+        wake_event = WakeEvent(websocket, msg["wake_start"]["wake_volume"])
+        wake_session.add_event(wake_event)
+
+
+async def _handle_wake_end(app, websocket, msg, client):
+    pass
+
+
+async def _handle_notify_done(app, websocket, msg, client):
+    app.notify_queue.done(websocket, msg["notify_done"])
+
+
+async def _handle_cmd(app, websocket, msg, client):
+    if msg["cmd"] == "endpoint":
+        # init_command_endpoint can replace the endpoint at any time, use the same one for the whole command
+        ep = app.command_endpoint
+        if ep is not None:
+            log.debug("Sending %s to %s", msg["data"], ep.name)
+            try:
+                resp = await ep.send(jsondata=msg["data"], ws=websocket, client=client)
+                if resp is not None:
+                    resp = ep.parse_response(resp)
+                    log.debug("Got response %s from endpoint", resp)
+                    # HomeAssistantWebSocketEndpoint sends message via callback
+                    if resp is not None:
+                        await websocket.send_text(resp)
+            except CommandEndpointRuntimeException as e:
+                await websocket.send_text(RESP_UNREACHABLE)
+                log.error(f"WAS Command Endpoint unreachable: {e}")
+
+        else:
+            await websocket.send_text(RESP_NOT_ACTIVE)
+            log.error("WAS Command Endpoint not active")
+
+    elif msg["cmd"] == "get_config":
+        await websocket.send_text(build_msg(get_config_db(), "config"))
+
+
+async def _handle_goodbye(app, websocket, msg, client):
+    disconnect(app, websocket)
+
+
+async def _handle_hello(app, websocket, msg, client):
+    hello = msg["hello"]
+    fields = {}
+
+    hostname = hello.get("hostname")
+    if hostname is not None:
+        fields["hostname"] = hostname
+
+    hw_type = hello.get("hw_type")
+    if hw_type is not None:
+        fields["platform"] = hw_type.upper()
+
+    mac_addr = hello.get("mac_addr")
+    if mac_addr is not None:
+        fields["mac_addr"] = hex_mac(mac_addr)
+
+    app.connmgr.update_client(websocket, **fields)
+
+
+HANDLERS = {
+    "wake_start": _handle_wake_start,
+    "wake_end": _handle_wake_end,
+    "notify_done": _handle_notify_done,
+    "cmd": _handle_cmd,
+    "goodbye": _handle_goodbye,
+    "hello": _handle_hello,
+}
+HANDLER_KEYS = frozenset(HANDLERS)
+RE_PAYLOADLESS_MSG = re.compile(r'\s*\{\s*"(wake_end|goodbye)"\s*:')
+
+
 # WebSockets with params return 403 when done with APIRouter
 # https://github.com/tiangolo/fastapi/issues/98#issuecomment-1688632239
 @app.websocket("/ws")
@@ -205,74 +322,25 @@ async def websocket_endpoint(
     try:
         while True:
             data = await websocket.receive_text()
-            log.debug(str(data))
-            msg = json.loads(data)
-
-            # latency sensitive so handle first
-            if "wake_start" in msg:
-                global wake_session
-                if wake_session is not None:
-                    if wake_session.done:
-                        del wake_session
-                        wake_session = WakeSession()
-                        asyncio.create_task(wake_session.cleanup())
-                else:
-                    wake_session = WakeSession()
-                    asyncio.create_task(wake_session.cleanup())
-
-                if "wake_volume" in msg["wake_start"]:
-                    wake_event = WakeEvent(websocket, msg["wake_start"]["wake_volume"])
-                    wake_session.add_event(wake_event)
-
-            elif "wake_end" in msg:
-                pass
-
-            elif "notify_done" in msg:
-                app.notify_queue.done(websocket, msg["notify_done"])
-
-            elif "cmd" in msg:
-                if msg["cmd"] == "endpoint":
-                    if app.command_endpoint is not None:
-                        log.debug(f"Sending {msg['data']} to {app.command_endpoint.name}")
-                        try:
-                            resp = app.command_endpoint.send(jsondata=msg["data"], ws=websocket, client=client)
-                            if resp is not None:
-                                resp = app.command_endpoint.parse_response(resp)
-                                log.debug(f"Got response {resp} from endpoint")
-                                # HomeAssistantWebSocketEndpoint sends message via callback
-                                if resp is not None:
-                                    asyncio.ensure_future(websocket.send_text(resp))
-                        except CommandEndpointRuntimeException as e:
-                            command_endpoint_result = CommandEndpointResult(speech="WAS Command Endpoint unreachable")
-                            command_endpoint_response = CommandEndpointResponse(result=command_endpoint_result)
-                            asyncio.ensure_future(websocket.send_text(command_endpoint_response.model_dump_json()))
-                            log.error(f"WAS Command Endpoint unreachable: {e}")
-
-                    else:
-                        command_endpoint_result = CommandEndpointResult(speech="WAS Command Endpoint not active")
-                        command_endpoint_response = CommandEndpointResponse(result=command_endpoint_result)
-                        asyncio.ensure_future(websocket.send_text(command_endpoint_response.model_dump_json()))
-                        log.error("WAS Command Endpoint not active")
-
-                elif msg["cmd"] == "get_config":
-                    asyncio.ensure_future(websocket.send_text(build_msg(get_config_db(), "config")))
-
-            elif "goodbye" in msg:
-                app.connmgr.disconnect(websocket)
-
-            elif "hello" in msg:
-                if "hostname" in msg["hello"]:
-                    app.connmgr.update_client(websocket, "hostname", msg["hello"]["hostname"])
-                if "hw_type" in msg["hello"]:
-                    platform = msg["hello"]["hw_type"].upper()
-                    app.connmgr.update_client(websocket, "platform", platform)
-                if "mac_addr" in msg["hello"]:
-                    mac_addr = hex_mac(msg["hello"]["mac_addr"])
-                    app.connmgr.update_client(websocket, "mac_addr", mac_addr)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(data)
+
+            # handlers for these messages don't use the payload, so skip decoding it
+            m = RE_PAYLOADLESS_MSG.match(data)
+            if m is not None:
+                await HANDLERS[m.group(1)](app, websocket, None, client)
+                continue
+
+            msg = ujson.loads(data)
+
+            key = next((k for k in msg if k in HANDLER_KEYS), None)
+            if key is not None:
+                await HANDLERS[key](app, websocket, msg, client)
 
     except WebSocketDisconnect:
-        app.connmgr.disconnect(websocket)
+        disconnect(app, websocket)
     except ConnectionClosed:
-        app.connmgr.disconnect(websocket)
+        disconnect(app, websocket)
     except Exception as e:
         log.error(f"unhandled exception in WebSocket route: {e}")
+        disconnect(app, websocket)
@@ -8,3 +8,11 @@ mock_releases_willow = [{
         }
     ]
 }]
+
+
+class MockWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, msg):
+        self.sent.append(msg)
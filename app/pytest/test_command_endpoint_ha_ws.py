@@ -0,0 +1,39 @@
+import asyncio
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from websockets.exceptions import ConnectionClosedError
+
+from app.internal.client import Client
+from app.internal.command_endpoints.ha_ws import HomeAssistantWebSocketEndpoint
+from app.main import RESP_UNREACHABLE, _handle_cmd
+from app.pytest.mock import MockWebSocket
+
+
+class MockHaWebSocket:
+    async def send(self, msg):
+        raise ConnectionClosedError(None, None)
+
+
+def handle_cmd_with_haws(haws):
+    async def run():
+        with patch.object(HomeAssistantWebSocketEndpoint, "connect", return_value=None):
+            endpoint = HomeAssistantWebSocketEndpoint(None, "ha.local", 8123, False, "token")
+        endpoint.haws = haws
+        app = SimpleNamespace(command_endpoint=endpoint)
+        ws = MockWebSocket()
+
+        msg = {"cmd": "endpoint", "data": {"text": "turn on the lights"}}
+        await _handle_cmd(app, ws, msg, Client())
+        return ws.sent
+
+    return asyncio.run(run())
+
+
+def test_send_unreachable():
+    assert handle_cmd_with_haws(MockHaWebSocket()) == [RESP_UNREACHABLE]
+
+
+def test_send_not_connected():
+    assert handle_cmd_with_haws(None) == [RESP_UNREACHABLE]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import httpx
+
+from app.internal.command_endpoints.openhab import OpenhabEndpoint
+from app.internal.command_endpoints.rest import RestEndpoint
+
+
+def mock_http_client(requests, redirect=None):
+    def handler(request):
+        requests.append(request)
+        if redirect is not None and request.url != redirect:
+            return httpx.Response(307, headers={"Location": redirect})
+        return httpx.Response(200, text="Done")
+
+    # follow_redirects matches the shared client created in lifespan
+    return httpx.AsyncClient(follow_redirects=True, transport=httpx.MockTransport(handler))
+
+
+def test_rest_endpoint_send():
+    requests = []
+    endpoint = RestEndpoint("http://rest.local/api", mock_http_client(requests))
+    endpoint.config.set_auth_type("header")
+    endpoint.config.set_auth_header("Bearer token")
+
+    response = asyncio.run(endpoint.send(jsondata={"text": "turn on the lights"}))
+
+    assert requests[0].url == "http://rest.local/api"
+    assert requests[0].headers["Authorization"] == "Bearer token"
+    assert json.loads(requests[0].content) == {"text": "turn on the lights"}
+    assert json.loads(endpoint.parse_response(response)) == {"result": {"ok": True, "speech": "Done"}}
+
+
+def test_rest_endpoint_send_redirect():
+    requests = []
+    endpoint = RestEndpoint("http://rest.local/api", mock_http_client(requests, redirect="http://rest.local/api/"))
+
+    response = asyncio.run(endpoint.send(jsondata={"text": "turn on the lights"}))
+
+    assert [str(request.url) for request in requests] == ["http://rest.local/api", "http://rest.local/api/"]
+    assert json.loads(endpoint.parse_response(response)) == {"result": {"ok": True, "speech": "Done"}}
+
+
+def test_rest_endpoint_parse_response():
+    endpoint = RestEndpoint("http://rest.local/api", None)
+
+    response = httpx.Response(202, text="Accepted")
+    assert json.loads(endpoint.parse_response(response))["result"]["ok"]
+
+    # requests treated every status below 400 as success
+    response = httpx.Response(304)
+    assert json.loads(endpoint.parse_response(response))["result"]["ok"]
+
+    response = httpx.Response(404, text="Not Found")
+    assert not json.loads(endpoint.parse_response(response))["result"]["ok"]
+
+
+def test_openhab_endpoint_send():
+    requests = []
+    endpoint = OpenhabEndpoint("http://openhab.local", "token", mock_http_client(requests))
+
+    asyncio.run(endpoint.send(jsondata={"text": "turn on the lights"}))
+
+    assert requests[0].url == "http://openhab.local/rest/voice/interpreters"
+    assert requests[0].headers["Content-Type"] == "text/plain"
+    assert requests[0].content == b"turn on the lights"
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.internal.client import Client
+from app.internal.connmgr import ConnMgr
+from app.pytest.mock import MockWebSocket
+
+
+def test_send():
+    async def run():
+        connmgr = ConnMgr()
+        ws = MockWebSocket()
+        connmgr.connected_clients[ws] = Client()
+
+        connmgr.send(ws, "one")
+        connmgr.send(ws, "two")
+        await asyncio.sleep(0)
+        assert ws.sent == ["one", "two"]
+
+        connmgr.disconnect(ws)
+        connmgr.send(ws, "three")
+        await asyncio.sleep(0)
+        assert ws.sent == ["one", "two"]
+
+    asyncio.run(run())
+
+
+def test_update_client():
+    connmgr = ConnMgr()
+    ws = MockWebSocket()
+    connmgr.connected_clients[ws] = Client()
+
+    connmgr.update_client(ws, hostname="willow", mac_addr="00:1a:2b:3c:4d:ff")
+
+    client = connmgr.get_client_by_ws(ws)
+    assert client.hostname == "willow"
+    assert client.platform == "unknown"
+    assert client.mac_addr == "00:1a:2b:3c:4d:ff"
+
+
+def test_send_failure():
+    class FailingWebSocket(MockWebSocket):
+        async def send_text(self, msg):
+            raise RuntimeError("connection lost")
+
+    async def run():
+        connmgr = ConnMgr()
+        ws = FailingWebSocket()
+        connmgr.connected_clients[ws] = Client()
+
+        connmgr.send(ws, "one")
+        await asyncio.sleep(0)
+        assert connmgr._send_queues == {}
+        assert connmgr._send_tasks == {}
+
+    asyncio.run(run())
@@ -0,0 +1,6 @@
+from app.main import hex_mac
+
+
+def test_hex_mac():
+    assert "00:1a:2b:3c:4d:ff" == hex_mac([0x00, 0x1a, 0x2b, 0x3c, 0x4d, 0xff])
+    assert "00:1a:2b:3c:4d:ff" == hex_mac("00:1a:2b:3c:4d:ff")
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.internal.command_endpoints.main import init_command_endpoint
+from app.internal.command_endpoints.rest import RestAuthType
+
+
+def init_with_config(app, user_config):
+    with patch("app.internal.command_endpoints.main.get_config_db", return_value=user_config):
+        init_command_endpoint(app)
+
+
+def test_init_command_endpoint():
+    app = SimpleNamespace(command_endpoint=None, http_client=None)
+    user_config = {
+        "command_endpoint": "REST",
+        "rest_url": "http://rest.local/api",
+        "was_mode": True,
+    }
+
+    init_with_config(app, user_config)
+    endpoint = app.command_endpoint
+    assert endpoint.name == "REST"
+    assert endpoint.url == "http://rest.local/api"
+
+    init_with_config(app, user_config | {"wis_url": "http://wis.local"})
+    assert app.command_endpoint is endpoint
+
+    init_with_config(app, user_config | {"rest_url": "http://rest.local/new"})
+    assert app.command_endpoint is not endpoint
+    assert app.command_endpoint.url == "http://rest.local/new"
+
+    init_with_config(app, user_config | {"was_mode": False})
+    assert app.command_endpoint is None
+
+
+def test_init_command_endpoint_rest_auth():
+    app = SimpleNamespace(command_endpoint=None, http_client=None)
+    user_config = {
+        "command_endpoint": "REST",
+        "rest_auth_pass": "password",
+        "rest_auth_type": "Basic",
+        "rest_auth_user": "user",
+        "rest_url": "http://rest.local/api",
+        "was_mode": True,
+    }
+
+    init_with_config(app, user_config)
+
+    assert app.command_endpoint.config.auth_type == RestAuthType.BASIC
+    assert app.command_endpoint.config.auth_user == "user"
+    assert app.command_endpoint.config.auth_pass == "password"
@@ -0,0 +1,31 @@
+import asyncio
+import json
+
+from app.internal.wake import WakeEvent, WakeSession
+from app.pytest.mock import MockWebSocket
+
+
+def test_wake_session():
+    loud = MockWebSocket()
+    quiet = MockWebSocket()
+    gone = MockWebSocket()
+
+    session = WakeSession()
+    session.add_event(WakeEvent(quiet, -30.0))
+    session.add_event(WakeEvent(loud, -20.0))
+    session.add_event(WakeEvent(gone, -10.0))
+    session.remove_client(gone)
+
+    asyncio.run(session.cleanup(timeout=0))
+
+    assert session.done
+    assert [json.loads(msg) for msg in loud.sent] == [{'wake_result': {'won': True}}]
+    assert [json.loads(msg) for msg in quiet.sent] == [{'wake_result': {'won': False}}]
+    assert gone.sent == []
+
+
+def test_wake_session_without_events():
+    session = WakeSession()
+    asyncio.run(session.cleanup(timeout=0))
+
+    assert session.done
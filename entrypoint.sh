@@ -12,4 +12,4 @@ python /app/misc/migrate_devices.py
 
 uvicorn app.main:app --host 0.0.0.0 --port 8502 --log-config uvicorn-log-config.json \
     --log-level "$LOG_LEVEL" --loop uvloop --timeout-graceful-shutdown 5 \
-    --no-server-header
+    --no-server-header --ws-per-message-deflate false